@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Biotools offline batch runner
+Runs the API sequence operations directly on local (optionally compressed) FASTA files,
+sharding the input at record boundaries and processing shards on all CPU cores
+"""
+
+import argparse
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+from Bio import SeqIO
+from sequence_ops import process_sequence, sequence_stats
+
+# 命令行操作名与 API 路由保持一致
+COMMANDS = {
+    "reverse-complement": "reverse_complement",
+    "transcribe": "transcribe",
+    "reverse-transcribe": "reverse_transcribe",
+    "translate": "translate",
+    "upper": "uppercase",
+    "lower": "lowercase",
+    "stats": "stats",
+}
+
+OUTPUT_FORMATS = ["fasta", "tsv", "ndjson"]
+
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024
+
+# 压缩格式的文件头标识
+_MAGIC = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+
+# 输入损坏、压缩流截断或工作进程异常退出时的可处理错误
+HANDLED_ERRORS = (ValueError, OSError, EOFError, zlib.error, lzma.LZMAError, BrokenProcessPool)
+
+TSV_COLUMNS = {
+    "stats": ["sequence_id", "sequence_type", "length", "gc_content",
+              "molecular_weight", "composition"],
+    "operation": ["sequence_id", "sequence_type", "result"],
+}
+
+def detect_opener(path: str):
+    """根据文件头判断压缩格式，普通文件返回 None"""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, opener in _MAGIC:
+        if head.startswith(magic):
+            return opener
+    return None
+
+def find_record_start(f, offset: int, size: int, block_size: int = 1 << 16) -> int:
+    """从 offset 开始查找下一条记录 ('>' 行首) 的字节位置"""
+    if offset <= 0:
+        return 0
+    # 从前一个字节开始读，以便识别恰好落在行首的 '>'
+    pos = offset - 1
+    f.seek(pos)
+    tail = b""
+    while pos < size:
+        block = f.read(block_size)
+        if not block:
+            break
+        buf = tail + block
+        idx = buf.find(b"\n>")
+        if idx >= 0:
+            return pos - len(tail) + idx + 1
+        tail = buf[-1:]
+        pos += len(block)
+    return size
+
+def plan_shards(path: str, shard_size: int) -> List[Tuple[int, int]]:
+    """将未压缩文件按记录边界切分为字节区间"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    boundaries = [0]
+    with open(path, "rb") as f:
+        offset = shard_size
+        while offset < size:
+            start = find_record_start(f, max(offset, boundaries[-1] + 1), size)
+            if start >= size:
+                break
+            boundaries.append(start)
+            offset = start + shard_size
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def read_shard(path: str, start: int, end: int) -> str:
+    """读取文件中的一个字节区间"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8")
+
+def iter_record_batches(path: str, opener, shard_size: int) -> Iterator[str]:
+    """流式读取压缩文件，按记录边界聚合为约 shard_size 大小的文本块"""
+    with opener(path, "rt", encoding="utf-8") as handle:
+        lines: List[str] = []
+        size = 0
+        for line in handle:
+            if line.startswith(">") and size >= shard_size:
+                yield "".join(lines)
+                lines = []
+                size = 0
+            lines.append(line)
+            size += len(line)
+        if lines:
+            yield "".join(lines)
+
+def format_fasta(item: Dict[str, Any], line_width: int) -> str:
+    """格式化单条 FASTA 输出"""
+    seq = item["result"]
+    if line_width > 0:
+        seq = "\n".join(seq[i:i + line_width] for i in range(0, len(seq), line_width))
+    return f">{item['sequence_id']}\n{seq}\n"
+
+def format_tsv(item: Dict[str, Any], columns: List[str]) -> str:
+    """格式化单条 TSV 输出"""
+    values = []
+    for column in columns:
+        value = item[column]
+        if column == "composition":
+            value = ",".join(f"{char}:{count}" for char, count in value.items())
+        values.append("" if value is None else str(value))
+    return "\t".join(values) + "\n"
+
+def format_item(item: Dict[str, Any], operation: str, output_format: str,
+                line_width: int) -> str:
+    """按输出格式序列化单条结果"""
+    if output_format == "ndjson":
+        return json.dumps(item, ensure_ascii=False) + "\n"
+    if output_format == "tsv":
+        key = "stats" if operation == "stats" else "operation"
+        return format_tsv(item, TSV_COLUMNS[key])
+    return format_fasta(item, line_width)
+
+def process_text(fasta_content: str, operation: str, seq_type: str, output_format: str,
+                 line_width: int) -> Tuple[str, int, List[Dict[str, str]]]:
+    """处理一段 FASTA 文本，返回序列化结果、记录数与错误详情"""
+    out = []
+    errors = []
+    total = 0
+    for seq_record in SeqIO.parse(io.StringIO(fasta_content), "fasta"):
+        total += 1
+        try:
+            if operation == "stats":
+                item = sequence_stats(str(seq_record.seq), seq_type, seq_record.id)
+            else:
+                item = process_sequence(str(seq_record.seq), seq_type, seq_record.id, operation)
+        except Exception as e:
+            errors.append({"sequence_id": seq_record.id, "error": str(e)})
+            continue
+        out.append(format_item(item, operation, output_format, line_width))
+    return "".join(out), total, errors
+
+def _process_range(path: str, start: int, end: int, *args) -> Tuple[str, int, List[Dict[str, str]]]:
+    """工作进程入口：处理未压缩文件的字节区间"""
+    return process_text(read_shard(path, start, end), *args)
+
+def run_ordered(executor: Optional[ProcessPoolExecutor], func, tasks: Iterator[tuple],
+                window: int) -> Iterator[Tuple[str, int, List[Dict[str, str]]]]:
+    """提交任务并按输入顺序产出结果，同时最多保留 window 个未完成任务"""
+    if executor is None:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    pending = []
+    for task in tasks:
+        pending.append(executor.submit(func, *task))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+def resolve_format(operation: str, output_format: Optional[str]) -> str:
+    """确定输出格式并检查与操作是否兼容"""
+    if output_format is None:
+        output_format = "tsv" if operation == "stats" else "fasta"
+    if operation == "stats" and output_format == "fasta":
+        raise ValueError("stats 操作不支持 FASTA 输出，请使用 tsv 或 ndjson")
+    return output_format
+
+def run(input_path: str, output, operation: str, seq_type: str = "auto",
+        output_format: Optional[str] = None, jobs: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE, line_width: int = 0) -> Dict[str, Any]:
+    """执行批量处理，将结果按输入顺序写入 output，返回汇总信息"""
+    output_format = resolve_format(operation, output_format)
+    jobs = jobs or os.cpu_count() or 1
+    args = (operation, seq_type, output_format, line_width)
+
+    opener = detect_opener(input_path)
+    if opener is None:
+        func = _process_range
+        tasks = ((input_path, start, end) + args
+                 for start, end in plan_shards(input_path, shard_size))
+    else:
+        func = process_text
+        tasks = ((text,) + args
+                 for text in iter_record_batches(input_path, opener, shard_size))
+
+    if output_format == "tsv":
+        key = "stats" if operation == "stats" else "operation"
+        output.write("\t".join(TSV_COLUMNS[key]) + "\n")
+
+    total_count = 0
+    errors: List[Dict[str, str]] = []
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        for text, total, shard_errors in run_ordered(executor, func, tasks, jobs * 2):
+            output.write(text)
+            total_count += total
+            errors.extend(shard_errors)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return {
+        "total_count": total_count,
+        "success_count": total_count - len(errors),
+        "error_count": len(errors),
+        "errors": errors,
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        description="Run Biotools sequence operations on local FASTA files without the HTTP API"
+    )
+    parser.add_argument("operation", choices=list(COMMANDS), help="Operation to run")
+    parser.add_argument("input", help="Input FASTA file (plain, gzip, bzip2 or xz)")
+    parser.add_argument("-o", "--output", default="-", help="Output file, '-' for stdout")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default=None,
+                        help="Output format (default: fasta, or tsv for stats)")
+    parser.add_argument("-t", "--sequence-type", default="auto",
+                        choices=["auto", "dna", "rna", "protein"],
+                        help="Sequence type")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help="Approximate shard size in bytes")
+    parser.add_argument("--line-width", type=int, default=0,
+                        help="Wrap FASTA output lines, 0 to disable")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    if args.shard_size <= 0:
+        print("--shard-size 必须为正数", file=sys.stderr)
+        return 2
+    if args.jobs is not None and args.jobs < 1:
+        print("--jobs 必须为正数", file=sys.stderr)
+        return 2
+
+    output = None
+    tmp_path = None
+    try:
+        resolve_format(COMMANDS[args.operation], args.format)
+        if not os.path.isfile(args.input):
+            raise ValueError(f"输入文件不存在: {args.input}")
+        if args.output == "-":
+            output = sys.stdout
+        else:
+            # 先写入同目录下的临时文件，成功后再替换，避免留下不完整的结果
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(args.output)),
+                prefix=f".{os.path.basename(args.output)}.",
+                suffix=".tmp",
+            )
+            output = os.fdopen(fd, "w", encoding="utf-8")
+        summary = run(
+            args.input,
+            output,
+            COMMANDS[args.operation],
+            args.sequence_type,
+            args.format,
+            args.jobs,
+            args.shard_size,
+            args.line_width,
+        )
+        if tmp_path is not None:
+            output.close()
+            # mkstemp 默认权限为 0600，按 umask 恢复普通文件权限
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, args.output)
+            tmp_path = None
+    except HANDLED_ERRORS as e:
+        print(f"处理文件时出错: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if tmp_path is not None:
+            output.close()
+            os.unlink(tmp_path)
+
+    # 错误详情始终写入 stderr，输出文件中只包含成功结果
+    for error in summary["errors"]:
+        print(f"{error['sequence_id']}\t{error['error']}", file=sys.stderr)
+    print(
+        f"总数: {summary['total_count']}  成功: {summary['success_count']}  "
+        f"错误: {summary['error_count']}",
+        file=sys.stderr,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
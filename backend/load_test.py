@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Biotools API 负载测试
+Drives /sequence/*, /fasta/* and upload endpoints with many concurrent async clients
+and reports throughput, latency percentiles and peak server RSS per scenario
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 各端点的请求类型与所需序列类型
+ENDPOINTS = {
+    "/sequence/reverse-complement": ("sequence", "dna"),
+    "/sequence/transcribe": ("sequence", "dna"),
+    "/sequence/reverse-transcribe": ("sequence", "rna"),
+    "/sequence/translate": ("sequence", "dna"),
+    "/sequence/case/upper": ("sequence", "dna"),
+    "/sequence/case/lower": ("sequence", "dna"),
+    "/sequence/stats": ("sequence", "dna"),
+    "/fasta/reverse-complement": ("fasta", "dna"),
+    "/fasta/transcribe": ("fasta", "dna"),
+    "/fasta/translate": ("fasta", "dna"),
+    "/fasta/stats": ("fasta", "dna"),
+    "/fasta/upload/reverse-complement": ("upload", "dna"),
+    "/fasta/upload/stats": ("upload", "dna"),
+}
+
+# 默认场景，可通过 --scenarios 指定 JSON 文件覆盖
+DEFAULT_SCENARIOS = [
+    {
+        "name": "sequence-small",
+        "concurrency": 32,
+        "requests": 2000,
+        "length": [50, 500],
+        "mix": {
+            "/sequence/reverse-complement": 3,
+            "/sequence/transcribe": 2,
+            "/sequence/reverse-transcribe": 1,
+            "/sequence/translate": 2,
+            "/sequence/case/upper": 1,
+            "/sequence/case/lower": 1,
+            "/sequence/stats": 3,
+        },
+    },
+    {
+        "name": "fasta-medium",
+        "concurrency": 16,
+        "requests": 500,
+        "records": [10, 100],
+        "length": [200, 2000],
+        "mix": {
+            "/fasta/reverse-complement": 2,
+            "/fasta/transcribe": 1,
+            "/fasta/translate": 1,
+            "/fasta/stats": 2,
+        },
+    },
+    {
+        "name": "upload-large",
+        "concurrency": 8,
+        "requests": 100,
+        "records": [200, 1000],
+        "length": [500, 5000],
+        "mix": {
+            "/fasta/upload/reverse-complement": 1,
+            "/fasta/upload/stats": 1,
+        },
+    },
+    {
+        "name": "mixed",
+        "concurrency": 64,
+        "requests": 2000,
+        "records": [1, 50],
+        "length": [50, 1000],
+        "mix": {
+            "/sequence/reverse-complement": 4,
+            "/sequence/stats": 4,
+            "/fasta/reverse-complement": 2,
+            "/fasta/stats": 2,
+            "/fasta/upload/stats": 1,
+        },
+    },
+]
+
+PAYLOADS_PER_ENDPOINT = 8
+
+def random_sequence(rng: random.Random, length: int, seq_type: str) -> str:
+    """生成随机 DNA/RNA 序列"""
+    alphabet = "ACGU" if seq_type == "rna" else "ACGT"
+    return "".join(rng.choices(alphabet, k=length))
+
+def random_fasta(rng: random.Random, records: int, length: Tuple[int, int],
+                 seq_type: str) -> Tuple[str, int]:
+    """生成随机 FASTA 内容，返回内容与碱基总数"""
+    lines = []
+    bases = 0
+    for i in range(records):
+        seq = random_sequence(rng, rng.randint(*length), seq_type)
+        bases += len(seq)
+        lines.append(f">seq{i + 1}")
+        lines.extend(seq[j:j + 60] for j in range(0, len(seq), 60))
+    return "\n".join(lines) + "\n", bases
+
+def _as_range(value, default: Tuple[int, int]) -> Tuple[int, int]:
+    """将场景中的整数或 [min, max] 转为区间"""
+    if value is None:
+        return default
+    if isinstance(value, int):
+        return value, value
+    return int(value[0]), int(value[1])
+
+def build_payloads(scenario: Dict[str, Any], rng: random.Random) -> Dict[str, List[Dict[str, Any]]]:
+    """为场景中的每个端点预先生成请求体，避免生成开销计入测量"""
+    length = _as_range(scenario.get("length"), (100, 1000))
+    records = _as_range(scenario.get("records"), (10, 100))
+    payloads = {}
+    for path in scenario["mix"]:
+        if path not in ENDPOINTS:
+            raise ValueError(f"未知的端点: {path}")
+        kind, seq_type = ENDPOINTS[path]
+        items = []
+        for _ in range(PAYLOADS_PER_ENDPOINT):
+            if kind == "sequence":
+                seq = random_sequence(rng, rng.randint(*length), seq_type)
+                items.append({
+                    "json": {"sequence": seq, "sequence_type": seq_type},
+                    "bases": len(seq),
+                })
+                continue
+            content, bases = random_fasta(rng, rng.randint(*records), length, seq_type)
+            if kind == "fasta":
+                items.append({
+                    "json": {"fasta_content": content, "sequence_type": seq_type},
+                    "bases": bases,
+                })
+            else:
+                items.append({
+                    "files": {"file": ("load_test.fasta", content.encode("utf-8"), "text/plain")},
+                    "bases": bases,
+                })
+        payloads[path] = items
+    return payloads
+
+def endpoint_picker(scenario: Dict[str, Any], rng: random.Random):
+    """返回按权重随机选择端点的函数"""
+    paths = list(scenario["mix"])
+    weights = [scenario["mix"][path] for path in paths]
+    return lambda: rng.choices(paths, weights=weights)[0]
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """最近秩法计算百分位数"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def read_rss(pid: int) -> Optional[int]:
+    """读取进程当前 RSS (字节)，不可用时返回 None"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+class RssSampler:
+    """后台线程周期性采样进程 RSS，记录峰值"""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        rss = read_rss(self.pid)
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+async def send(client: httpx.AsyncClient, path: str, payload: Dict[str, Any]) -> int:
+    """发送单个请求，返回状态码"""
+    if "files" in payload:
+        response = await client.post(path, files=payload["files"])
+    else:
+        response = await client.post(path, json=payload["json"])
+    await response.aread()
+    return response.status_code
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Dict[str, Any],
+                       server_pid: Optional[int], seed: int, warmup: int) -> Dict[str, Any]:
+    """执行单个场景并汇总结果"""
+    rng = random.Random(seed)
+    payloads = build_payloads(scenario, rng)
+    concurrency = int(scenario.get("concurrency", 16))
+    duration = scenario.get("duration")
+    pick = endpoint_picker(scenario, rng)
+
+    for _ in range(warmup):
+        path = pick()
+        await send(client, path, payloads[path][0])
+
+    latencies: List[float] = []
+    per_endpoint: Dict[str, Dict[str, Any]] = {
+        path: {"requests": 0, "errors": 0, "bases": 0, "latencies": []} for path in scenario["mix"]
+    }
+    status_counts: Dict[str, int] = {}
+    # 指定持续时间时只由截止时间结束，否则发送固定数量的请求
+    if duration is not None:
+        counter = itertools.count()
+    else:
+        counter = iter(range(int(scenario.get("requests", 1000))))
+    deadline = None
+
+    async def worker():
+        for i in counter:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            path = pick()
+            payload = payloads[path][i % len(payloads[path])]
+            start = time.perf_counter()
+            try:
+                status = await send(client, path, payload)
+                key = str(status)
+            except httpx.HTTPError as e:
+                status = None
+                key = type(e).__name__
+            elapsed = time.perf_counter() - start
+            status_counts[key] = status_counts.get(key, 0) + 1
+            stats = per_endpoint[path]
+            stats["requests"] += 1
+            if status == 200:
+                latencies.append(elapsed)
+                stats["latencies"].append(elapsed)
+                stats["bases"] += payload["bases"]
+            else:
+                stats["errors"] += 1
+
+    sampler = RssSampler(server_pid) if server_pid is not None else None
+    started = time.perf_counter()
+    if duration is not None:
+        deadline = started + float(duration)
+    if sampler is not None:
+        with sampler:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return summarize(scenario, concurrency, wall, latencies, per_endpoint, status_counts,
+                     sampler.peak if sampler is not None else None)
+
+def latency_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    """延迟统计 (毫秒)"""
+    ordered = sorted(values)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+        "p50": ms(percentile(ordered, 50)),
+        "p95": ms(percentile(ordered, 95)),
+        "p99": ms(percentile(ordered, 99)),
+        "max": ms(ordered[-1]) if ordered else None,
+    }
+
+def summarize(scenario: Dict[str, Any], concurrency: int, wall: float, latencies: List[float],
+              per_endpoint: Dict[str, Dict[str, Any]], status_counts: Dict[str, int],
+              peak_rss: Optional[int]) -> Dict[str, Any]:
+    """汇总场景结果"""
+    requests_done = sum(stats["requests"] for stats in per_endpoint.values())
+    errors = sum(stats["errors"] for stats in per_endpoint.values())
+    bases = sum(stats["bases"] for stats in per_endpoint.values())
+    duration = scenario.get("duration")
+    endpoints = {}
+    for path, stats in per_endpoint.items():
+        endpoints[path] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "bases": stats["bases"],
+            "latency_ms": latency_summary(stats["latencies"]),
+        }
+    return {
+        "name": scenario["name"],
+        "concurrency": concurrency,
+        "planned_requests": None if duration is not None else int(scenario.get("requests", 1000)),
+        "planned_duration_s": float(duration) if duration is not None else None,
+        "requests": requests_done,
+        "errors": errors,
+        "status_counts": status_counts,
+        "duration_s": round(wall, 3),
+        "requests_per_s": round(requests_done / wall, 2) if wall > 0 else None,
+        "bases": bases,
+        "bases_per_s": round(bases / wall, 2) if wall > 0 else None,
+        "latency_ms": latency_summary(latencies),
+        "peak_rss_mb": round(peak_rss / (1024 * 1024), 2) if peak_rss is not None else None,
+        "endpoints": endpoints,
+    }
+
+def free_port() -> int:
+    """获取一个空闲端口"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, timeout: float = 30.0) -> subprocess.Popen:
+    """以子进程方式启动 uvicorn，并等待健康检查通过"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"服务启动失败，退出码 {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError("等待服务启动超时")
+
+def stop_server(process: subprocess.Popen):
+    """停止子进程服务"""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def git_revision() -> Optional[str]:
+    """获取当前 git 提交，用于跨版本对比"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run_all(args, scenarios: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """按模式连接服务并依次执行所有场景"""
+    process = None
+    server_pid = args.pid
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.mode == "asgi":
+        sys.path.insert(0, BACKEND_DIR)
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://testserver"
+        # 进程内模式下服务与压测客户端共享进程，无法单独统计服务端 RSS
+        server_pid = None
+    elif args.mode == "spawn":
+        port = free_port()
+        process = start_server(port)
+        transport = None
+        base_url = f"http://127.0.0.1:{port}"
+        server_pid = process.pid
+    else:
+        transport = None
+        base_url = args.url
+
+    results = []
+    try:
+        async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits,
+                                     timeout=timeout) as client:
+            try:
+                response = await client.get("/health")
+            except httpx.HTTPError as e:
+                raise RuntimeError(f"无法连接到 API 服务器 {base_url}: {e}")
+            if response.status_code != 200:
+                raise RuntimeError(f"健康检查失败，状态码 {response.status_code}")
+
+            for index, scenario in enumerate(scenarios):
+                print(f"▶ {scenario['name']} ...", file=sys.stderr)
+                result = await run_scenario(client, scenario, server_pid,
+                                            args.seed + index, args.warmup)
+                print_result(result)
+                results.append(result)
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "mode": args.mode,
+            "rss_scope": "server" if server_pid is not None else None,
+            "base_url": base_url,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+def print_result(result: Dict[str, Any]):
+    """输出单个场景的结果摘要"""
+    latency = result["latency_ms"]
+    rss = result["peak_rss_mb"]
+    print(
+        f"  {result['requests']} 请求, {result['errors']} 错误, "
+        f"{result['requests_per_s']} req/s, {result['bases_per_s']} bases/s, "
+        f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+        f"峰值 RSS {rss if rss is not None else '-'} MB",
+        file=sys.stderr,
+    )
+
+# 对比报告时必须一致的运行环境与场景配置
+COMPARABLE_META = ["mode", "cpu_count"]
+COMPARABLE_SCENARIO = ["concurrency", "planned_requests", "planned_duration_s"]
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """与基准报告对比关键指标"""
+    previous = {result["name"]: result for result in baseline.get("scenarios", [])}
+    print("与基准对比:", file=sys.stderr)
+    meta, base_meta = current["meta"], baseline.get("meta", {})
+    for key in COMPARABLE_META:
+        if meta.get(key) != base_meta.get(key):
+            print(f"  ⚠ {key} 不一致: 当前 {meta.get(key)}, 基准 {base_meta.get(key)}，"
+                  f"结果不可直接比较", file=sys.stderr)
+    for result in current["scenarios"]:
+        before = previous.get(result["name"])
+        if before is None:
+            print(f"  {result['name']}: 基准中不存在", file=sys.stderr)
+            continue
+        mismatched = [key for key in COMPARABLE_SCENARIO if result.get(key) != before.get(key)]
+        if mismatched:
+            details = ", ".join(f"{key} {result.get(key)} vs {before.get(key)}" for key in mismatched)
+            print(f"  {result['name']}: 跳过，场景配置不一致 ({details})", file=sys.stderr)
+            continue
+        parts = []
+        for label, now, then in [
+            ("req/s", result["requests_per_s"], before.get("requests_per_s")),
+            ("bases/s", result["bases_per_s"], before.get("bases_per_s")),
+            ("p95", result["latency_ms"]["p95"], before.get("latency_ms", {}).get("p95")),
+            ("rss", result["peak_rss_mb"], before.get("peak_rss_mb")),
+        ]:
+            if now is None or not then:
+                parts.append(f"{label} -")
+            else:
+                parts.append(f"{label} {(now - then) / then * 100:+.1f}%")
+        print(f"  {result['name']}: " + ", ".join(parts), file=sys.stderr)
+
+def load_scenarios(args) -> List[Dict[str, Any]]:
+    """读取场景配置并应用命令行覆盖"""
+    if args.scenarios:
+        with open(args.scenarios, encoding="utf-8") as f:
+            scenarios = json.load(f)
+    else:
+        scenarios = [dict(scenario) for scenario in DEFAULT_SCENARIOS]
+
+    if args.only:
+        names = set(args.only)
+        scenarios = [scenario for scenario in scenarios if scenario["name"] in names]
+    for scenario in scenarios:
+        if args.concurrency is not None:
+            scenario["concurrency"] = args.concurrency
+        if args.requests is not None:
+            scenario["requests"] = args.requests
+        if args.duration is not None:
+            scenario["duration"] = args.duration
+    return scenarios
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(description="Load-test the Biotools API")
+    parser.add_argument("--mode", choices=["asgi", "spawn", "url"], default="spawn",
+                        help="asgi: in-process client; spawn: launch uvicorn locally; "
+                             "url: use an already running server")
+    parser.add_argument("--url", default="http://localhost:8000",
+                        help="Server URL for --mode url")
+    parser.add_argument("--pid", type=int, default=None,
+                        help="Server PID for RSS sampling in --mode url")
+    parser.add_argument("--scenarios", help="JSON file with a list of scenarios")
+    parser.add_argument("--only", nargs="+", help="Run only the named scenarios")
+    parser.add_argument("-c", "--concurrency", type=int, default=None,
+                        help="Override concurrent clients for every scenario")
+    parser.add_argument("-n", "--requests", type=int, default=None,
+                        help="Override request count for every scenario")
+    parser.add_argument("-d", "--duration", type=float, default=None,
+                        help="Run each scenario for this many seconds, ignoring request counts")
+    parser.add_argument("--warmup", type=int, default=20,
+                        help="Unmeasured warm-up requests per scenario")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for payload generation")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """主入口"""
+    args = build_parser().parse_args(argv)
+    if args.mode == "url" and not args.url:
+        print("--mode url 需要指定 --url", file=sys.stderr)
+        return 2
+
+    try:
+        scenarios = load_scenarios(args)
+        report = asyncio.run(run_all(args, scenarios))
+    except (ValueError, RuntimeError, OSError, httpx.HTTPError) as e:
+        print(f"❌ 负载测试失败: {e}", file=sys.stderr)
+        return 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare_reports(report, json.load(f))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,15 +8,18 @@ from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List, Union
-import re
 import io
-from Bio.Seq import Seq
-from Bio.SeqUtils import molecular_weight
-from Bio.SeqUtils.ProtParam import ProteinAnalysis
 from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
 import uvicorn
 from i18n import _, get_language_from_header, get_api_description
+from sequence_ops import (
+    detect_sequence_type,
+    validate_sequence,
+    clean_sequence,
+    process_sequence,
+    sequence_stats,
+)
 
 # 创建 FastAPI 应用
 app = FastAPI(
@@ -76,49 +79,6 @@ class BatchSequenceStats(BaseModel):
     errors: List[Dict[str, str]] = Field(default_factory=list, description="错误详情")
 
 # 工具函数
-def detect_sequence_type(sequence: str) -> str:
-    """自动检测序列类型"""
-    clean_seq = re.sub(r'[^A-Za-z]', '', sequence.upper())
-    
-    if not clean_seq:
-        return "unknown"
-    
-    # 检查是否包含蛋白质特有的氨基酸
-    protein_chars = set('EFHIKLMNPQRSVWY')
-    if any(char in protein_chars for char in clean_seq):
-        return "protein"
-    
-    # 检查是否包含 U (RNA)
-    if 'U' in clean_seq and 'T' not in clean_seq:
-        return "rna"
-    
-    # 检查是否包含 T (DNA)
-    if 'T' in clean_seq and 'U' not in clean_seq:
-        return "dna"
-    
-    # 只包含 A, C, G 的情况，默认为 DNA
-    if all(char in 'ACGT' for char in clean_seq):
-        return "dna"
-    
-    return "unknown"
-
-def validate_sequence(sequence: str, seq_type: str) -> bool:
-    """验证序列格式"""
-    clean_seq = re.sub(r'[^A-Za-z]', '', sequence.upper())
-    
-    if seq_type == "dna":
-        return all(char in 'ATCG' for char in clean_seq)
-    elif seq_type == "rna":
-        return all(char in 'AUCG' for char in clean_seq)
-    elif seq_type == "protein":
-        return all(char in 'ACDEFGHIKLMNPQRSTVWY*' for char in clean_seq)
-    
-    return False
-
-def clean_sequence(sequence: str) -> str:
-    """清理序列，移除空格和非字母字符"""
-    return re.sub(r'[^A-Za-z]', '', sequence.upper())
-
 def parse_fasta_content(fasta_content: str) -> List[SeqRecord]:
     """解析 FASTA 格式内容"""
     try:
@@ -131,90 +91,11 @@ def parse_fasta_content(fasta_content: str) -> List[SeqRecord]:
 def process_single_sequence(sequence: str, seq_type: str, seq_id: Optional[str], 
                           operation: str) -> SequenceOutput:
     """处理单个序列的通用函数"""
-    clean_seq = clean_sequence(sequence)
-    
-    if seq_type == "auto":
-        seq_type = detect_sequence_type(clean_seq)
-    
-    try:
-        bio_seq = Seq(clean_seq)
-        
-        if operation == "reverse_complement":
-            if seq_type != "dna":
-                raise ValueError("只支持 DNA 序列的反向互补操作")
-            result = str(bio_seq.reverse_complement())
-        elif operation == "transcribe":
-            if seq_type != "dna":
-                raise ValueError("只支持 DNA 序列的转录操作")
-            result = str(bio_seq.transcribe())
-            seq_type = "rna"
-        elif operation == "reverse_transcribe":
-            if seq_type != "rna":
-                raise ValueError("只支持 RNA 序列的反转录操作")
-            result = str(bio_seq.back_transcribe())
-            seq_type = "dna"
-        elif operation == "translate":
-            if seq_type not in ["dna", "rna"]:
-                raise ValueError("只支持 DNA 或 RNA 序列的翻译操作")
-            result = str(bio_seq.translate())
-            seq_type = "protein"
-        elif operation == "uppercase":
-            result = sequence.upper()
-        elif operation == "lowercase":
-            result = sequence.lower()
-        else:
-            raise ValueError(f"不支持的操作: {operation}")
-        
-        return SequenceOutput(
-            result=result,
-            original_sequence=sequence,
-            sequence_type=seq_type,
-            sequence_id=seq_id
-        )
-    except Exception as e:
-        raise ValueError(str(e))
+    return SequenceOutput(**process_sequence(sequence, seq_type, seq_id, operation))
 
 def calculate_sequence_stats(sequence: str, seq_type: str, seq_id: Optional[str]) -> SequenceStats:
     """计算序列统计信息"""
-    clean_seq = clean_sequence(sequence)
-    
-    if seq_type == "auto":
-        seq_type = detect_sequence_type(clean_seq)
-    
-    # 计算碱基/氨基酸组成
-    composition = {}
-    for char in set(clean_seq):
-        composition[char] = clean_seq.count(char)
-    
-    stats = SequenceStats(
-        length=len(clean_seq),
-        composition=composition,
-        sequence_type=seq_type,
-        sequence_id=seq_id
-    )
-    
-    # 计算 GC 含量 (仅对 DNA/RNA)
-    if seq_type in ["dna", "rna"]:
-        try:
-            bio_seq = Seq(clean_seq)
-            # 手动计算 GC 含量
-            gc_count = clean_seq.count('G') + clean_seq.count('C')
-            total_count = len(clean_seq)
-            if total_count > 0:
-                stats.gc_content = round((gc_count / total_count) * 100, 2)
-            stats.molecular_weight = round(molecular_weight(bio_seq), 2)
-        except:
-            pass
-    
-    # 计算蛋白质分子量
-    elif seq_type == "protein":
-        try:
-            protein_analysis = ProteinAnalysis(clean_seq)
-            stats.molecular_weight = round(protein_analysis.molecular_weight(), 2)
-        except:
-            pass
-    
-    return stats
+    return SequenceStats(**sequence_stats(sequence, seq_type, seq_id))
 
 # API 路由
 @app.get("/")
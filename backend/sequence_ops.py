@@ -0,0 +1,156 @@
+"""
+Biotools sequence kernels
+Pure sequence processing functions shared by the HTTP API and the offline CLI
+"""
+
+from typing import Optional, Dict, Any
+import re
+from Bio.Seq import Seq
+from Bio.SeqUtils import molecular_weight
+from Bio.SeqUtils.ProtParam import ProteinAnalysis
+
+# 支持的序列操作
+OPERATIONS = [
+    "reverse_complement",
+    "transcribe",
+    "reverse_transcribe",
+    "translate",
+    "uppercase",
+    "lowercase",
+]
+
+_NON_ALPHA = re.compile(r'[^A-Za-z]')
+
+def detect_sequence_type(sequence: str) -> str:
+    """自动检测序列类型"""
+    clean_seq = _NON_ALPHA.sub('', sequence.upper())
+
+    if not clean_seq:
+        return "unknown"
+
+    # 检查是否包含蛋白质特有的氨基酸
+    protein_chars = set('EFHIKLMNPQRSVWY')
+    if any(char in protein_chars for char in clean_seq):
+        return "protein"
+
+    # 检查是否包含 U (RNA)
+    if 'U' in clean_seq and 'T' not in clean_seq:
+        return "rna"
+
+    # 检查是否包含 T (DNA)
+    if 'T' in clean_seq and 'U' not in clean_seq:
+        return "dna"
+
+    # 只包含 A, C, G 的情况，默认为 DNA
+    if all(char in 'ACGT' for char in clean_seq):
+        return "dna"
+
+    return "unknown"
+
+def validate_sequence(sequence: str, seq_type: str) -> bool:
+    """验证序列格式"""
+    clean_seq = _NON_ALPHA.sub('', sequence.upper())
+
+    if seq_type == "dna":
+        return all(char in 'ATCG' for char in clean_seq)
+    elif seq_type == "rna":
+        return all(char in 'AUCG' for char in clean_seq)
+    elif seq_type == "protein":
+        return all(char in 'ACDEFGHIKLMNPQRSTVWY*' for char in clean_seq)
+
+    return False
+
+def clean_sequence(sequence: str) -> str:
+    """清理序列，移除空格和非字母字符"""
+    return _NON_ALPHA.sub('', sequence.upper())
+
+def process_sequence(sequence: str, seq_type: str, seq_id: Optional[str],
+                     operation: str) -> Dict[str, Any]:
+    """处理单个序列，返回与 SequenceOutput 字段一致的字典"""
+    clean_seq = clean_sequence(sequence)
+
+    if seq_type == "auto":
+        seq_type = detect_sequence_type(clean_seq)
+
+    try:
+        bio_seq = Seq(clean_seq)
+
+        if operation == "reverse_complement":
+            if seq_type != "dna":
+                raise ValueError("只支持 DNA 序列的反向互补操作")
+            result = str(bio_seq.reverse_complement())
+        elif operation == "transcribe":
+            if seq_type != "dna":
+                raise ValueError("只支持 DNA 序列的转录操作")
+            result = str(bio_seq.transcribe())
+            seq_type = "rna"
+        elif operation == "reverse_transcribe":
+            if seq_type != "rna":
+                raise ValueError("只支持 RNA 序列的反转录操作")
+            result = str(bio_seq.back_transcribe())
+            seq_type = "dna"
+        elif operation == "translate":
+            if seq_type not in ["dna", "rna"]:
+                raise ValueError("只支持 DNA 或 RNA 序列的翻译操作")
+            result = str(bio_seq.translate())
+            seq_type = "protein"
+        elif operation == "uppercase":
+            result = sequence.upper()
+        elif operation == "lowercase":
+            result = sequence.lower()
+        else:
+            raise ValueError(f"不支持的操作: {operation}")
+
+        return {
+            "result": result,
+            "original_sequence": sequence,
+            "sequence_type": seq_type,
+            "sequence_id": seq_id,
+            "metadata": None,
+        }
+    except Exception as e:
+        raise ValueError(str(e))
+
+def sequence_stats(sequence: str, seq_type: str, seq_id: Optional[str]) -> Dict[str, Any]:
+    """计算序列统计信息，返回与 SequenceStats 字段一致的字典"""
+    clean_seq = clean_sequence(sequence)
+
+    if seq_type == "auto":
+        seq_type = detect_sequence_type(clean_seq)
+
+    # 计算碱基/氨基酸组成 (按字符排序，保证输出稳定)
+    composition = {}
+    for char in sorted(set(clean_seq)):
+        composition[char] = clean_seq.count(char)
+
+    stats = {
+        "length": len(clean_seq),
+        "composition": composition,
+        "gc_content": None,
+        "molecular_weight": None,
+        "sequence_type": seq_type,
+        "sequence_id": seq_id,
+    }
+
+    # 计算 GC 含量 (仅对 DNA/RNA)
+    if seq_type in ["dna", "rna"]:
+        try:
+            bio_seq = Seq(clean_seq)
+            # 手动计算 GC 含量
+            gc_count = composition.get('G', 0) + composition.get('C', 0)
+            total_count = len(clean_seq)
+            if total_count > 0:
+                stats["gc_content"] = round((gc_count / total_count) * 100, 2)
+            stats["molecular_weight"] = round(molecular_weight(bio_seq), 2)
+        except:
+            pass
+
+    # 计算蛋白质分子量
+    elif seq_type == "protein":
+        try:
+            protein_analysis = ProteinAnalysis(clean_seq)
+            stats["molecular_weight"] = round(protein_analysis.molecular_weight(), 2)
+        except:
+            pass
+
+    return stats
@@ -0,0 +1,142 @@
+"""
+离线批处理与 API 结果一致性测试
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import random
+import httpx
+import pytest
+import cli
+from main import app
+
+OPERATIONS = {
+    "reverse_complement": "/fasta/reverse-complement",
+    "transcribe": "/fasta/transcribe",
+    "translate": "/fasta/translate",
+    "stats": "/fasta/stats",
+}
+
+def make_fasta(seed: int = 0, records: int = 60) -> str:
+    """生成包含 DNA/RNA/蛋白质/空序列的测试 FASTA"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(records):
+        alphabet = rng.choice(["ACGT", "ACGU", "ACDEFGHIKLMNPQRSTVWY", "acgtn"])
+        seq = "".join(rng.choices(alphabet, k=rng.randint(0, 200)))
+        lines.append(f">rec{i} description {i}")
+        lines.extend(seq[j:j + 60] for j in range(0, len(seq), 60))
+    return "\n".join(lines) + "\n"
+
+def api_results(fasta_content: str, operation: str):
+    """通过 API 获取批量处理结果"""
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.post(OPERATIONS[operation], json={"fasta_content": fasta_content})
+
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    body = response.json()
+    return body["results"], body["errors"]
+
+def cli_results(path, operation: str, jobs: int, shard_size: int):
+    """通过离线批处理获取 NDJSON 结果"""
+    output = io.StringIO()
+    summary = cli.run(str(path), output, operation, output_format="ndjson",
+                      jobs=jobs, shard_size=shard_size)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    return results, summary
+
+def write_input(tmp_path, content: str, compressed: bool):
+    """写入测试输入文件"""
+    data = content.encode("utf-8")
+    if compressed:
+        path = tmp_path / "input.fa.gz"
+        path.write_bytes(gzip.compress(data))
+    else:
+        path = tmp_path / "input.fa"
+        path.write_bytes(data)
+    return path
+
+def assert_parity(path, content: str, operation: str, jobs: int, shard_size: int):
+    expected_results, expected_errors = api_results(content, operation)
+    results, summary = cli_results(path, operation, jobs, shard_size)
+    assert results == expected_results
+    assert summary["errors"] == expected_errors
+    assert summary["total_count"] == len(expected_results) + len(expected_errors)
+
+@pytest.mark.parametrize("operation", list(OPERATIONS))
+@pytest.mark.parametrize("shard_size", [1, 100, 5000, 10 ** 8])
+@pytest.mark.parametrize("jobs", [1, 4])
+@pytest.mark.parametrize("compressed", [False, True])
+def test_cli_matches_api(tmp_path, operation, shard_size, jobs, compressed):
+    content = make_fasta()
+    path = write_input(tmp_path, content, compressed)
+    assert_parity(path, content, operation, jobs, shard_size)
+
+@pytest.mark.parametrize("shard_size", [1, 50, 10 ** 8])
+def test_cli_matches_api_crlf(tmp_path, shard_size):
+    content = make_fasta(seed=1).replace("\n", "\r\n")
+    path = write_input(tmp_path, content, False)
+    for operation in OPERATIONS:
+        assert_parity(path, content, operation, 2, shard_size)
+
+@pytest.mark.parametrize("shard_size", [1, 50, 10 ** 8])
+def test_cli_matches_api_leading_text(tmp_path, shard_size):
+    content = "exported by some tool\n\n" + make_fasta(seed=2)
+    path = write_input(tmp_path, content, False)
+    for operation in OPERATIONS:
+        assert_parity(path, content, operation, 2, shard_size)
+
+def test_plan_shards_cover_file(tmp_path):
+    content = make_fasta(seed=3)
+    path = write_input(tmp_path, content, False)
+    shards = cli.plan_shards(str(path), 100)
+    assert shards[0][0] == 0
+    assert shards[-1][1] == len(content.encode("utf-8"))
+    data = path.read_bytes()
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert data[start:start + 1] == b">"
+
+def test_main_keeps_output_on_invalid_options(tmp_path):
+    path = write_input(tmp_path, make_fasta(), False)
+    output = tmp_path / "out.txt"
+    output.write_text("previous")
+    assert cli.main(["stats", str(path), "-f", "fasta", "-o", str(output)]) == 1
+    assert cli.main(["stats", str(tmp_path / "missing.fa"), "-o", str(output)]) == 1
+    assert output.read_text() == "previous"
+    assert cli.main(["stats", str(path), "-o", str(tmp_path / "missing" / "out.tsv")]) == 1
+
+def test_main_rejects_invalid_jobs(tmp_path):
+    path = write_input(tmp_path, make_fasta(), False)
+    assert cli.main(["stats", str(path), "-j", "0"]) == 2
+    assert cli.main(["stats", str(path), "-j", "-3"]) == 2
+
+def test_main_truncated_gzip_leaves_no_output(tmp_path):
+    data = gzip.compress(make_fasta(records=500).encode("utf-8"))
+    path = tmp_path / "input.fa.gz"
+    path.write_bytes(data[:len(data) // 2])
+    output = tmp_path / "out.tsv"
+    assert cli.main(["stats", str(path), "-o", str(output), "-j", "1", "--shard-size", "100"]) == 1
+    assert list(tmp_path.iterdir()) == [path]
+
+def test_main_writes_stats_tsv(tmp_path):
+    path = write_input(tmp_path, ">a first\nACGT\nGG\n>b\nMKV\n", False)
+    output = tmp_path / "out.tsv"
+    assert cli.main(["stats", str(path), "-o", str(output), "-j", "1"]) == 0
+    assert output.read_text().splitlines() == [
+        "sequence_id\tsequence_type\tlength\tgc_content\tmolecular_weight\tcomposition",
+        "a\tdna\t6\t66.67\t1912.21\tA:1,C:1,G:3,T:1",
+        "b\tprotein\t3\t\t376.51\tK:1,M:1,V:1",
+    ]
+
+def test_main_writes_wrapped_fasta(tmp_path):
+    path = write_input(tmp_path, ">a\nAAAACCCCGG\n>b\nTTT\n", False)
+    output = tmp_path / "out.fa"
+    assert cli.main(["reverse-complement", str(path), "-o", str(output), "-j", "1",
+                     "--line-width", "4"]) == 0
+    assert output.read_text() == ">a\nCCGG\nGGTT\nTT\n>b\nAAA\n"
@@ -0,0 +1,90 @@
+"""
+负载测试工具函数测试
+"""
+
+import json
+import pytest
+from load_test import ENDPOINTS, percentile, load_scenarios, build_parser, compare_reports, main
+
+@pytest.mark.parametrize("n, pct, rank", [
+    (100, 50, 50),
+    (100, 95, 95),
+    (100, 99, 99),
+    (100, 100, 100),
+    (20, 95, 19),
+    (300, 1, 3),
+    (10, 0, 1),
+    (1, 99, 1),
+    (7, 50, 4),
+])
+def test_percentile_nearest_rank(n, pct, rank):
+    values = [float(i) for i in range(1, n + 1)]
+    assert percentile(values, pct) == rank
+
+def test_percentile_empty():
+    assert percentile([], 95) is None
+
+def test_duration_does_not_set_request_count(tmp_path):
+    path = tmp_path / "scenarios.json"
+    path.write_text('[{"name": "s", "mix": {"/sequence/stats": 1}}]')
+    args = build_parser().parse_args(["--scenarios", str(path), "-d", "5"])
+    scenarios = load_scenarios(args)
+    assert scenarios == [{"name": "s", "mix": {"/sequence/stats": 1}, "duration": 5.0}]
+
+def run_asgi(tmp_path, extra):
+    """以进程内模式运行负载测试并读取报告"""
+    output = tmp_path / "report.json"
+    assert main(["--mode", "asgi", "-c", "2", "--warmup", "0", "-o", str(output)] + extra) == 0
+    return json.loads(output.read_text())
+
+def test_asgi_smoke(tmp_path):
+    report = run_asgi(tmp_path, ["-n", "10", "--only", "sequence-small"])
+    assert report["meta"]["rss_scope"] is None
+    result = report["scenarios"][0]
+    assert result["requests"] == 10
+    assert result["errors"] == 0
+    assert result["status_counts"] == {"200": 10}
+    assert result["planned_requests"] == 10
+    assert result["planned_duration_s"] is None
+    latency = result["latency_ms"]
+    assert latency["p50"] is not None
+    assert latency["p50"] <= latency["p95"] <= latency["p99"]
+    assert result["peak_rss_mb"] is None
+
+def test_asgi_errors_excluded_from_latency(tmp_path, monkeypatch):
+    # 向 RNA 反转录端点发送 DNA 序列，使其固定返回 400
+    monkeypatch.setitem(ENDPOINTS, "/sequence/reverse-transcribe", ("sequence", "dna"))
+    scenarios = tmp_path / "scenarios.json"
+    scenarios.write_text(json.dumps([{
+        "name": "failing",
+        "length": [10, 20],
+        "mix": {"/sequence/reverse-transcribe": 1, "/sequence/stats": 1},
+    }]))
+    report = run_asgi(tmp_path, ["-n", "20", "--scenarios", str(scenarios)])
+    result = report["scenarios"][0]
+    failing = result["endpoints"]["/sequence/reverse-transcribe"]
+    ok = result["endpoints"]["/sequence/stats"]
+    assert result["requests"] == 20
+    assert failing["errors"] == failing["requests"] > 0
+    assert failing["latency_ms"]["p50"] is None
+    assert failing["bases"] == 0
+    assert result["errors"] == failing["requests"]
+    assert result["status_counts"] == {"400": failing["requests"], "200": ok["requests"]}
+    assert result["bases"] == ok["bases"]
+
+def test_compare_reports_flags_mismatches(capsys):
+    scenario = {
+        "name": "s", "concurrency": 2, "planned_requests": 10, "planned_duration_s": None,
+        "requests_per_s": 100.0, "bases_per_s": 1000.0, "latency_ms": {"p95": 1.0},
+        "peak_rss_mb": None,
+    }
+    baseline = {"meta": {"mode": "spawn", "cpu_count": 4}, "scenarios": [scenario]}
+    current = {
+        "meta": {"mode": "asgi", "cpu_count": 4},
+        "scenarios": [dict(scenario, planned_requests=None, planned_duration_s=1.0)],
+    }
+    compare_reports(current, baseline)
+    err = capsys.readouterr().err
+    assert "mode 不一致" in err
+    assert "cpu_count" not in err
+    assert "跳过" in err and "req/s" not in err